@@ -1,19 +1,38 @@
 import logging
+from typing import Optional
 
-import streamlit as st
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("app.log"), logging.StreamHandler()],
-)
+from musictool.models import DatabaseConfig, initialize_database
 
 logger = logging.getLogger(__name__)
 
 
+def configure_logging() -> None:
+    """Configure logging on first run instead of at import time."""
+    if logging.getLogger().handlers:
+        return
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler("app.log"), logging.StreamHandler()],
+    )
+
+
+def get_config(database_url: Optional[str] = None) -> DatabaseConfig:
+    """Initialize the database once and reuse it across Streamlit reruns."""
+    import streamlit as st
+
+    # The cache is keyed on the wrapped function, so wrapping it per call
+    # still returns the one cached config
+    return st.cache_resource(initialize_database)(database_url)
+
+
 def main() -> None:
     """Main Streamlit application entry point."""
+    # Imported here so CLI tools and tests importing this module skip the UI stack
+    import streamlit as st
+
+    configure_logging()
+
     st.set_page_config(
         page_title="MusicTool",
         page_icon="🎵",
@@ -26,12 +45,14 @@ def main() -> None:
 
     st.info("This is the initial setup. The application is ready for development.")
 
+    config = get_config()
+
     # Display basic system info
     st.subheader("System Status")
     col1, col2 = st.columns(2)
 
     with col1:
-        st.metric("Database", "Not connected", delta="Setup required")
+        st.metric("Database", "Connected", delta=config.engine.dialect.name)
 
     with col2:
         st.metric("Data Sources", "0", delta="None configured")
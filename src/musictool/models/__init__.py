@@ -1,4 +1,8 @@
-"""Database models and data access layer for MusicTool."""
+"""Database models and data access layer for MusicTool.
+
+The asyncio variants live in ``async_config`` and ``async_repositories``
+and need the ``async`` extra.
+"""
 
 from .config import (
     DatabaseConfig,
@@ -0,0 +1,126 @@
+"""Database configuration and connection management for asyncio code.
+
+Needs the ``async`` extra (SQLAlchemy's asyncio support and the drivers),
+so it is kept apart from the sync configuration in ``config``.
+"""
+
+import os
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import (
+    DEFAULT_DATABASE_URL,
+    DEFAULT_QUERY_CACHE_SIZE,
+    _engine_options,
+    _is_memory_database,
+    _set_sqlite_pragmas,
+    _tables_created,
+)
+from .database import Base, ensure_tracks_fts
+
+# asyncio drivers used by AsyncDatabaseConfig for URLs without one
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _async_database_url(database_url: str) -> str:
+    """Switch a database URL to its asyncio driver.
+
+    URLs naming a sync driver (e.g. postgresql+psycopg2://) are switched
+    too; URLs that already name an asyncio driver are kept as they are.
+    """
+    url = make_url(database_url)
+    if not url.get_dialect().is_async:
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No asyncio driver configured for {backend} databases")
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+class AsyncDatabaseConfig:
+    """Database configuration settings for asyncio code (e.g. importers)."""
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.database_url = _async_database_url(
+            database_url or os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+        )
+        options = _engine_options(self.database_url)
+        if options.get("poolclass") is QueuePool:
+            options["poolclass"] = AsyncAdaptedQueuePool
+        self.engine = create_async_engine(
+            self.database_url,
+            echo=os.getenv("SQL_DEBUG", "false").lower() == "true",
+            query_cache_size=DEFAULT_QUERY_CACHE_SIZE,
+            **options,
+        )
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
+        self.SessionLocal = async_sessionmaker(
+            autoflush=False, bind=self.engine, expire_on_commit=False
+        )
+
+    async def create_tables(self) -> None:
+        """Create all database tables."""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.run_sync(ensure_tracks_fts)
+
+    def get_session(self) -> AsyncSession:
+        """Get a new database session."""
+        return self.SessionLocal()
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """Provide a transactional scope around a series of operations."""
+        session = self.get_session()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+# Global asyncio database configuration instance
+async_db_config: Optional[AsyncDatabaseConfig] = None
+
+
+async def initialize_async_database(
+    database_url: Optional[str] = None,
+) -> AsyncDatabaseConfig:
+    """Initialize the global asyncio database configuration."""
+    global async_db_config
+    async_db_config = AsyncDatabaseConfig(database_url)
+    if (
+        async_db_config.database_url not in _tables_created
+        or _is_memory_database(async_db_config.database_url)
+    ):
+        await async_db_config.create_tables()
+        _tables_created.add(async_db_config.database_url)
+    return async_db_config
+
+
+def get_async_database_config() -> AsyncDatabaseConfig:
+    """Get the global asyncio database configuration."""
+    if async_db_config is None:
+        raise RuntimeError(
+            "Async database not initialized. Call initialize_async_database() first."
+        )
+    return async_db_config
+
+
+@asynccontextmanager
+async def db_session_scope_async() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an asyncio transactional scope around a series of operations."""
+    async with get_async_database_config().session_scope() as session:
+        yield session
@@ -0,0 +1,163 @@
+"""Repository pattern implementation for asyncio sessions.
+
+Needs the ``async`` extra, so it is kept apart from the sync repositories.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy import func, insert, lambda_stmt, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import (
+    DigitalTrack,
+    ImportBatch,
+    PhysicalTrack,
+    Release,
+    Track,
+)
+from .repositories import BULK_INSERT_CHUNK_SIZE, IN_CLAUSE_CHUNK_SIZE
+
+
+class AsyncBaseRepository(ABC):
+    """Base repository with common CRUD operations for asyncio sessions."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @abstractmethod
+    def get_model_class(self):
+        """Return the SQLAlchemy model class."""
+        raise NotImplementedError
+
+    async def get_by_id(self, id: int):
+        """Get a record by ID, from the identity map when already loaded."""
+        return await self.session.get(self.get_model_class(), id)
+
+    async def get_all(self, limit: Optional[int] = None, offset: int = 0):
+        """Get all records with optional pagination."""
+        stmt = select(self.get_model_class())
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit:
+            stmt = stmt.limit(limit)
+        return list(await self.session.scalars(stmt))
+
+    async def create(self, flush: bool = True, **kwargs):
+        """Create a new record."""
+        obj = self.get_model_class()(**kwargs)
+        self.session.add(obj)
+        if flush:
+            await self.session.flush()  # Get the ID without committing
+        return obj
+
+    async def create_many(self, rows: list[dict], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> None:
+        """Create many records at once, without tracking them in the session."""
+        model = self.get_model_class()
+        for start in range(0, len(rows), chunk_size):
+            await self.session.execute(insert(model), rows[start : start + chunk_size])
+
+    async def update(self, id: int, **kwargs):
+        """Update a record by ID."""
+        obj = await self.get_by_id(id)
+        if obj:
+            for key, value in kwargs.items():
+                if hasattr(obj, key):
+                    setattr(obj, key, value)
+            await self.session.flush()
+        return obj
+
+    async def delete(self, id: int) -> bool:
+        """Delete a record by ID."""
+        obj = await self.get_by_id(id)
+        if obj:
+            await self.session.delete(obj)
+            await self.session.flush()
+            return True
+        return False
+
+    async def count(self) -> int:
+        """Count total records."""
+        stmt = select(func.count()).select_from(self.get_model_class())
+        return await self.session.scalar(stmt) or 0
+
+
+class AsyncTrackRepository(AsyncBaseRepository):
+    """Asyncio repository for Track entities."""
+
+    def get_model_class(self):
+        return Track
+
+    async def find_by_artist_and_title(self, artist: str, title: str) -> Optional[Track]:
+        """Find track by artist and title (exact match)."""
+        stmt = lambda_stmt(
+            lambda: select(Track).where(Track.artist == artist, Track.title == title).limit(1)
+        )
+        return (await self.session.execute(stmt)).scalars().first()
+
+
+class AsyncDigitalTrackRepository(AsyncBaseRepository):
+    """Asyncio repository for DigitalTrack entities."""
+
+    def get_model_class(self):
+        return DigitalTrack
+
+    async def find_by_file_paths(self, file_paths: list[str]) -> dict[str, DigitalTrack]:
+        """Find digital tracks for many file paths at once, keyed by path."""
+        found: dict[str, DigitalTrack] = {}
+        for start in range(0, len(file_paths), IN_CLAUSE_CHUNK_SIZE):
+            chunk = file_paths[start : start + IN_CLAUSE_CHUNK_SIZE]
+            stmt = select(DigitalTrack).where(DigitalTrack.file_path.in_(chunk))
+            for digital in await self.session.scalars(stmt):
+                found[digital.file_path] = digital
+        return found
+
+
+class AsyncPhysicalTrackRepository(AsyncBaseRepository):
+    """Asyncio repository for PhysicalTrack entities."""
+
+    def get_model_class(self):
+        return PhysicalTrack
+
+
+class AsyncReleaseRepository(AsyncBaseRepository):
+    """Asyncio repository for Release entities."""
+
+    def get_model_class(self):
+        return Release
+
+    async def find_by_discogs_id(self, discogs_id: int) -> Optional[Release]:
+        """Find release by Discogs ID."""
+        stmt = select(Release).where(Release.discogs_id == discogs_id)
+        return await self.session.scalar(stmt)
+
+
+class AsyncImportBatchRepository(AsyncBaseRepository):
+    """Asyncio repository for ImportBatch entities."""
+
+    def get_model_class(self):
+        return ImportBatch
+
+
+class AsyncRepositoryManager:
+    """Manages all asyncio repositories for a database session."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.tracks = AsyncTrackRepository(session)
+        self.digital_tracks = AsyncDigitalTrackRepository(session)
+        self.physical_tracks = AsyncPhysicalTrackRepository(session)
+        self.releases = AsyncReleaseRepository(session)
+        self.import_batches = AsyncImportBatchRepository(session)
+
+    async def commit(self):
+        """Commit the current transaction."""
+        await self.session.commit()
+
+    async def rollback(self):
+        """Rollback the current transaction."""
+        await self.session.rollback()
+
+    async def flush(self):
+        """Flush the session (execute pending operations without committing)."""
+        await self.session.flush()
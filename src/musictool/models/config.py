@@ -5,14 +5,73 @@ from collections.abc import Generator
 from contextlib import contextmanager
 from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
-from .database import Base
+from .database import Base, ensure_tracks_fts
 
 # Default database configuration
 DEFAULT_DATABASE_URL = "sqlite:///musictool.db"
 
+# Connection pool defaults for server databases (PostgreSQL, MySQL, ...)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_RECYCLE = 1800  # Seconds before a pooled connection is replaced
+
+# Compiled SQL statements kept per engine (SQLAlchemy's default is 500)
+DEFAULT_QUERY_CACHE_SIZE = 1200
+
+# Applied to every new SQLite connection. WAL lets readers run during
+# writes, and with WAL synchronous=NORMAL stays crash-safe while skipping
+# an fsync per commit.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA temp_store=MEMORY",
+]
+
+
+def _is_memory_database(database_url: str) -> bool:
+    """Check if the URL points to an in-memory SQLite database."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    if url.query.get("uri") == "true":
+        # URI filenames: file::memory:?cache=shared or file:name?mode=memory
+        return ":memory:" in database or url.query.get("mode") == "memory"
+    return database in ("", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """Tune a new SQLite connection for the import-heavy workload."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _engine_options(database_url: str) -> dict:
+    """Build connection pool options for the given database URL."""
+    if make_url(database_url).get_backend_name() == "sqlite":
+        options: dict = {"connect_args": {"check_same_thread": False}}
+        if _is_memory_database(database_url):
+            # Share the single connection so the in-memory database survives
+            # across sessions and threads (e.g. Streamlit reruns)
+            options["poolclass"] = StaticPool
+        return options
+
+    return {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)),
+        "pool_pre_ping": True,  # Transparently replace dropped connections
+        "pool_recycle": DEFAULT_POOL_RECYCLE,
+    }
+
 
 class DatabaseConfig:
     """Database configuration settings."""
@@ -24,19 +83,20 @@ class DatabaseConfig:
         self.engine = create_engine(
             self.database_url,
             echo=os.getenv("SQL_DEBUG", "false").lower() == "true",
-            connect_args=(
-                {"check_same_thread": False}
-                if "sqlite" in self.database_url
-                else {}
-            ),
+            query_cache_size=DEFAULT_QUERY_CACHE_SIZE,
+            **_engine_options(self.database_url),
         )
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
 
     def create_tables(self) -> None:
         """Create all database tables."""
-        Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as connection:
+            Base.metadata.create_all(bind=connection)
+            ensure_tracks_fts(connection)
 
     def get_session(self) -> Session:
         """Get a new database session."""
@@ -56,15 +116,24 @@ class DatabaseConfig:
             session.close()
 
 
-# Global database configuration instance
+# Global database configuration instances
 db_config: Optional[DatabaseConfig] = None
 
+# Database URLs whose tables were already created by this process
+_tables_created: set[str] = set()
+
 
 def initialize_database(database_url: Optional[str] = None) -> DatabaseConfig:
     """Initialize the global database configuration."""
     global db_config
     db_config = DatabaseConfig(database_url)
-    db_config.create_tables()
+    # In-memory databases are new for every engine, so always create them
+    if (
+        db_config.database_url not in _tables_created
+        or _is_memory_database(db_config.database_url)
+    ):
+        db_config.create_tables()
+        _tables_created.add(db_config.database_url)
     return db_config
 
 
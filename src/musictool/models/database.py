@@ -2,37 +2,81 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-
 from sqlalchemy import (
+    DDL,
     Column,
     DateTime,
+    Enum,
     ForeignKey,
-    Index,
     Integer,
     String,
-    create_engine,
+    UniqueConstraint,
+    column,
+    event,
+    exists,
+    inspect,
+    table,
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import declarative_base, object_session, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 Base = declarative_base()
 
+# Fixed vocabularies, stored as native enums where the database supports them
+DIGITAL_FORMATS = ("mp3", "flac", "wav", "aiff", "m4a", "ogg")
+RELEASE_FORMAT_TYPES = ("vinyl", "cd", "cassette", "digital")
+IMPORT_STATUSES = ("pending", "success", "error")
+
+
+class utcnow(FunctionElement):
+    """Current UTC timestamp, rendered per dialect.
+
+    func.now() is server-local time on PostgreSQL and MySQL, whereas
+    SQLite's CURRENT_TIMESTAMP is already UTC.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "mysql")
+@compiles(utcnow, "mariadb")
+def _compile_utcnow_mysql(element, compiler, **kw):
+    return "UTC_TIMESTAMP()"
+
 
 class Track(Base):
     """Core track entity representing a unique musical work."""
 
     __tablename__ = "tracks"
+    # The unique index also serves artist-only lookups
+    __table_args__ = (UniqueConstraint("artist", "title", name="uq_tracks_artist_title"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     artist = Column(String(255), nullable=False)
-    title = Column(String(255), nullable=False)
-    album = Column(String(255), nullable=True)
+    title = Column(String(255), nullable=False, index=True)
+    album = Column(String(255), nullable=True, index=True)
     label = Column(String(255), nullable=True)
-    year = Column(Integer, nullable=True)
+    year = Column(Integer, nullable=True, index=True)
     duration_ms = Column(Integer, nullable=True)  # Duration in milliseconds
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime,
+        default=utcnow(),
+        server_default=utcnow(),
+        onupdate=utcnow(),
+        nullable=False,
     )
 
     # Relationships
@@ -49,12 +93,25 @@ class Track(Base):
     @property
     def has_digital_format(self) -> bool:
         """Check if track has any digital formats."""
-        return len(self.digital_tracks) > 0
+        return self._has_related("digital_tracks", DigitalTrack)
 
     @property
     def has_physical_format(self) -> bool:
         """Check if track has any physical formats."""
-        return len(self.physical_tracks) > 0
+        return self._has_related("physical_tracks", PhysicalTrack)
+
+    def _has_related(
+        self, relationship_name: str, model: type[DigitalTrack] | type[PhysicalTrack]
+    ) -> bool:
+        """Check a format relationship for rows without loading it.
+
+        Falls back to the collection itself when it is already loaded or
+        the track is not persisted in a session.
+        """
+        session = object_session(self)
+        if session is None or self.id is None or relationship_name in self.__dict__:
+            return len(getattr(self, relationship_name)) > 0
+        return session.query(exists().where(model.track_id == self.id)).scalar()
 
 
 class DigitalTrack(Base):
@@ -63,12 +120,16 @@ class DigitalTrack(Base):
     __tablename__ = "digital_tracks"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    track_id = Column(Integer, ForeignKey("tracks.id"), nullable=False)
-    file_path = Column(String(512), nullable=False)
-    format = Column(String(10), nullable=False)  # mp3, flac, wav, etc.
+    track_id = Column(Integer, ForeignKey("tracks.id"), nullable=False, index=True)
+    file_path = Column(String(512), nullable=False, index=True)
+    format = Column(
+        Enum(*DIGITAL_FORMATS, name="digital_format", create_constraint=True, validate_strings=True),
+        nullable=False,
+        index=True,
+    )
     bitrate = Column(Integer, nullable=True)  # kbps
     source_file = Column(String(512), nullable=False)  # Original NML file path
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
 
     # Relationships
     track = relationship("Track", back_populates="digital_tracks")
@@ -86,13 +147,18 @@ class Release(Base):
     __tablename__ = "releases"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    discogs_id = Column(Integer, nullable=True, unique=True)  # Discogs release ID
+    # Discogs release ID
+    discogs_id = Column(Integer, nullable=True, unique=True, index=True)
     title = Column(String(255), nullable=False)
     artist = Column(String(255), nullable=False)
     label = Column(String(255), nullable=True)
-    year = Column(Integer, nullable=True)
-    format_type = Column(String(50), nullable=False)  # vinyl, cd, cassette, etc.
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    year = Column(Integer, nullable=True, index=True)
+    format_type = Column(
+        Enum(*RELEASE_FORMAT_TYPES, name="release_format_type", create_constraint=True, validate_strings=True),
+        nullable=False,
+        index=True,
+    )
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
 
     # Relationships
     physical_tracks = relationship(
@@ -112,10 +178,10 @@ class PhysicalTrack(Base):
     __tablename__ = "physical_tracks"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    track_id = Column(Integer, ForeignKey("tracks.id"), nullable=False)
-    release_id = Column(Integer, ForeignKey("releases.id"), nullable=False)
+    track_id = Column(Integer, ForeignKey("tracks.id"), nullable=False, index=True)
+    release_id = Column(Integer, ForeignKey("releases.id"), nullable=False, index=True)
     position = Column(String(10), nullable=True)  # A1, B2, 1, 2, etc.
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
 
     # Relationships
     track = relationship("Track", back_populates="physical_tracks")
@@ -132,13 +198,16 @@ class ImportBatch(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     # traktor_nml, discogs_api, discogs_csv
-    source_type = Column(String(50), nullable=False)
+    source_type = Column(String(50), nullable=False, index=True)
     source_file = Column(String(512), nullable=True)  # File path if applicable
     records_imported = Column(Integer, nullable=False, default=0)
-    # pending, success, error
-    status = Column(String(20), nullable=False, default="pending")
+    status = Column(
+        Enum(*IMPORT_STATUSES, name="import_status", create_constraint=True, validate_strings=True),
+        nullable=False,
+        default="pending",
+    )
     error_message = Column(String(1000), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False, index=True)
 
     def __repr__(self) -> str:
         return (
@@ -147,39 +216,69 @@ class ImportBatch(Base):
         )
 
 
-# Create indexes for performance
-Index("idx_tracks_artist_title", Track.artist, Track.title)
-Index("idx_tracks_artist", Track.artist)
-Index("idx_tracks_title", Track.title)
-Index("idx_tracks_album", Track.album)
-Index("idx_digital_tracks_track_id", DigitalTrack.track_id)
-Index("idx_digital_tracks_file_path", DigitalTrack.file_path)
-Index("idx_physical_tracks_track_id", PhysicalTrack.track_id)
-Index("idx_physical_tracks_release_id", PhysicalTrack.release_id)
-Index("idx_releases_discogs_id", Release.discogs_id)
-Index("idx_import_batches_source_type", ImportBatch.source_type)
-Index("idx_import_batches_created_at", ImportBatch.created_at)
-
-
-# Database engine and session configuration
-def create_database_engine(database_url: str):
-    """Create and configure the database engine."""
-    engine = create_engine(
-        database_url,
-        echo=False,  # Set to True for SQL debugging
-        connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-    )
-    return engine
-
+# Full-text search over track artist/title/album. On SQLite an FTS5 index
+# is kept in sync with the tracks table by triggers; on PostgreSQL trigram
+# GIN indexes make substring ILIKE searches index-assisted.
+tracks_fts = table("tracks_fts", column("rowid"), column("rank"))
 
-def create_database_session(engine):
-    """Create a database session factory."""
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal
+_TRACKS_FTS_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE tracks_fts USING fts5(
+        artist, title, album, content='tracks', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER tracks_fts_insert AFTER INSERT ON tracks BEGIN
+        INSERT INTO tracks_fts(rowid, artist, title, album)
+        VALUES (new.id, new.artist, new.title, new.album);
+    END
+    """,
+    """
+    CREATE TRIGGER tracks_fts_delete AFTER DELETE ON tracks BEGIN
+        INSERT INTO tracks_fts(tracks_fts, rowid, artist, title, album)
+        VALUES ('delete', old.id, old.artist, old.title, old.album);
+    END
+    """,
+    """
+    CREATE TRIGGER tracks_fts_update AFTER UPDATE ON tracks BEGIN
+        INSERT INTO tracks_fts(tracks_fts, rowid, artist, title, album)
+        VALUES ('delete', old.id, old.artist, old.title, old.album);
+        INSERT INTO tracks_fts(rowid, artist, title, album)
+        VALUES (new.id, new.artist, new.title, new.album);
+    END
+    """,
+]
+
+_TRACKS_TRGM_POSTGRESQL_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX idx_tracks_artist_trgm ON tracks USING gin (artist gin_trgm_ops)",
+    "CREATE INDEX idx_tracks_title_trgm ON tracks USING gin (title gin_trgm_ops)",
+    "CREATE INDEX idx_tracks_album_trgm ON tracks USING gin (album gin_trgm_ops)",
+]
+
+for statement in _TRACKS_FTS_SQLITE_DDL:
+    event.listen(Track.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _TRACKS_TRGM_POSTGRESQL_DDL:
+    event.listen(Track.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    Track.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tracks_fts").execute_if(dialect="sqlite"),
+)
 
 
-def init_database(database_url: str):
-    """Initialize the database with all tables."""
-    engine = create_database_engine(database_url)
-    Base.metadata.create_all(bind=engine)
-    return engine
+def ensure_tracks_fts(connection) -> None:
+    """Add tracks_fts to a SQLite database created before it existed.
+
+    The DDL above only runs when create_all() creates the tracks table, so
+    older databases get the FTS table and triggers here, and the index is
+    filled from the rows already present.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    inspector = inspect(connection)
+    if not inspector.has_table("tracks") or inspector.has_table("tracks_fts"):
+        return
+    for statement in _TRACKS_FTS_SQLITE_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO tracks_fts(tracks_fts) VALUES ('rebuild')")
@@ -1,11 +1,34 @@
 """Repository pattern implementation for data access."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, insert, lambda_stmt, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from .database import DigitalTrack, ImportBatch, PhysicalTrack, Release, Track
+from .database import (
+    DigitalTrack,
+    ImportBatch,
+    PhysicalTrack,
+    Release,
+    Track,
+    tracks_fts,
+)
+
+# Number of rows sent per statement by bulk inserts
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Number of values per IN (...) list, well below SQLite's bound parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# INSERT constructs supporting ON CONFLICT, by dialect name
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
 
 
 class BaseRepository(ABC):
@@ -20,23 +43,56 @@ class BaseRepository(ABC):
         raise NotImplementedError
 
     def get_by_id(self, id: int):
-        """Get a record by ID."""
-        return self.session.query(self.get_model_class()).filter_by(id=id).first()
+        """Get a record by ID, from the identity map when already loaded."""
+        return self.session.get(self.get_model_class(), id)
 
     def get_all(self, limit: Optional[int] = None, offset: int = 0):
         """Get all records with optional pagination."""
-        query = self.session.query(self.get_model_class()).offset(offset)
+        query = self.session.query(self.get_model_class())
+        if offset:
+            query = query.offset(offset)
         if limit:
             query = query.limit(limit)
         return query.all()
 
-    def create(self, **kwargs):
-        """Create a new record."""
+    def iter_all(self, chunk_size: int = 1000) -> Iterator:
+        """Iterate over all records, fetching them in chunks.
+
+        Memory use stays constant regardless of table size, which makes
+        this the method to use for exports and other full-table passes.
+        """
+        yield from self.session.query(self.get_model_class()).yield_per(chunk_size)
+
+    def create(self, flush: bool = True, **kwargs):
+        """Create a new record.
+
+        Pass flush=False when the ID is not needed right away; the insert is
+        then sent together with the rest of the transaction.
+        """
         obj = self.get_model_class()(**kwargs)
         self.session.add(obj)
-        self.session.flush()  # Get the ID without committing
+        if flush:
+            self.session.flush()  # Get the ID without committing
         return obj
 
+    def create_many(self, rows: list[dict], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> None:
+        """Create many records at once, without tracking them in the session."""
+        model = self.get_model_class()
+        for start in range(0, len(rows), chunk_size):
+            self.session.bulk_insert_mappings(model, rows[start : start + chunk_size])
+
+    def create_many_returning(self, rows: list[dict]) -> list[int]:
+        """Create many records at once and return their IDs in input order.
+
+        Requires a database with INSERT ... RETURNING support
+        (PostgreSQL, SQLite 3.35+).
+        """
+        if not rows:
+            return []
+        model = self.get_model_class()
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(self.session.scalars(stmt, rows))
+
     def update(self, id: int, **kwargs):
         """Update a record by ID."""
         obj = self.get_by_id(id)
@@ -60,6 +116,17 @@ class BaseRepository(ABC):
         """Count total records."""
         return self.session.query(self.get_model_class()).count()
 
+    def _all(self, stmt: Select, limit: Optional[int] = None) -> list:
+        """Run a select() statement and return all of its entities.
+
+        Values in select() constructs are sent as bound parameters, so each
+        statement shape is compiled once and reused from the engine's
+        compiled cache.
+        """
+        if limit:
+            stmt = stmt.limit(limit)
+        return list(self.session.scalars(stmt))
+
 
 class TrackRepository(BaseRepository):
     """Repository for Track entities."""
@@ -69,43 +136,68 @@ class TrackRepository(BaseRepository):
 
     def find_by_artist_and_title(self, artist: str, title: str) -> Optional[Track]:
         """Find track by artist and title (exact match)."""
-        return self.session.query(Track).filter_by(artist=artist, title=title).first()
+        # Called once per row during imports: lambda_stmt caches the compiled SQL
+        stmt = lambda_stmt(
+            lambda: select(Track).where(Track.artist == artist, Track.title == title).limit(1)
+        )
+        return self.session.execute(stmt).scalars().first()
+
+    def upsert_many(self, rows: list[dict]) -> None:
+        """Insert tracks, skipping any whose artist and title already exist.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING, so re-imports need neither a
+        SELECT per row nor a check-then-insert race.
+
+        Relies on the uq_tracks_artist_title unique index, which create_all()
+        does not add to an existing tracks table. Databases created before it
+        must drop duplicate (artist, title) rows, repointing their
+        digital/physical tracks to the kept row, and then run
+        CREATE UNIQUE INDEX uq_tracks_artist_title ON tracks (artist, title).
+        """
+        if not rows:
+            return
+        dialect_name = self.session.get_bind().dialect.name
+        if dialect_name not in _UPSERT_INSERTS:
+            raise ValueError(f"upsert_many is not supported on {dialect_name}")
+        stmt = _UPSERT_INSERTS[dialect_name](Track).on_conflict_do_nothing(
+            index_elements=["artist", "title"]
+        )
+        self.session.execute(stmt, rows)
 
     def search_by_artist(self, artist: str, limit: Optional[int] = None) -> list[Track]:
         """Search tracks by artist (case-insensitive partial match)."""
-        query = self.session.query(Track).filter(Track.artist.ilike(f"%{artist}%"))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+        return self._all(select(Track).where(Track.artist.ilike(f"%{artist}%")), limit)
 
     def search_by_title(self, title: str, limit: Optional[int] = None) -> list[Track]:
         """Search tracks by title (case-insensitive partial match)."""
-        query = self.session.query(Track).filter(Track.title.ilike(f"%{title}%"))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+        return self._all(select(Track).where(Track.title.ilike(f"%{title}%")), limit)
 
     def search_by_album(self, album: str, limit: Optional[int] = None) -> list[Track]:
         """Search tracks by album (case-insensitive partial match)."""
-        query = self.session.query(Track).filter(Track.album.ilike(f"%{album}%"))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+        return self._all(select(Track).where(Track.album.ilike(f"%{album}%")), limit)
 
     def find_by_year(self, year: int) -> list[Track]:
         """Find tracks by release year."""
-        return self.session.query(Track).filter_by(year=year).all()
+        return self._all(select(Track).where(Track.year == year))
 
     def get_with_digital_formats(self, limit: Optional[int] = None) -> list[Track]:
-        """Get tracks that have digital formats."""
-        query = self.session.query(Track).join(DigitalTrack)
+        """Get tracks that have digital formats, with those formats loaded."""
+        query = (
+            self.session.query(Track)
+            .join(DigitalTrack)
+            .options(selectinload(Track.digital_tracks))
+        )
         if limit:
             query = query.limit(limit)
         return query.all()
 
     def get_with_physical_formats(self, limit: Optional[int] = None) -> list[Track]:
-        """Get tracks that have physical formats."""
-        query = self.session.query(Track).join(PhysicalTrack)
+        """Get tracks that have physical formats, with those formats loaded."""
+        query = (
+            self.session.query(Track)
+            .join(PhysicalTrack)
+            .options(selectinload(Track.physical_tracks))
+        )
         if limit:
             query = query.limit(limit)
         return query.all()
@@ -123,6 +215,47 @@ class TrackRepository(BaseRepository):
             query = query.limit(limit)
         return query.all()
 
+    def search_fts(self, query: str, limit: Optional[int] = None) -> list[Track]:
+        """Full-text search across artist, title and album.
+
+        Every word in the query must match; on SQLite words match as
+        prefixes (e.g. "daft pun" finds "Daft Punk") and results are
+        ordered by relevance.
+
+        On SQLite this needs the tracks_fts table; create_tables() adds it
+        to databases created before it existed.
+        """
+        words = query.split()
+        if not words:
+            return []
+
+        if self.session.get_bind().dialect.name == "sqlite":
+            # Quote each word so FTS5 operators in user input are literal
+            match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+            fts_query = (
+                self.session.query(Track)
+                .join(tracks_fts, tracks_fts.c.rowid == Track.id)
+                .filter(literal_column("tracks_fts").op("MATCH")(match))
+                .order_by(tracks_fts.c.rank)
+            )
+        else:
+            fts_query = self.session.query(Track).filter(
+                and_(
+                    *(
+                        or_(
+                            Track.artist.ilike(f"%{word}%"),
+                            Track.title.ilike(f"%{word}%"),
+                            Track.album.ilike(f"%{word}%"),
+                        )
+                        for word in words
+                    )
+                )
+            )
+
+        if limit:
+            fts_query = fts_query.limit(limit)
+        return fts_query.all()
+
     def search_tracks(
         self,
         artist: Optional[str] = None,
@@ -132,21 +265,18 @@ class TrackRepository(BaseRepository):
         limit: Optional[int] = None,
     ) -> list[Track]:
         """Advanced search across multiple fields."""
-        query = self.session.query(Track)
+        stmt = select(Track)
 
         if artist:
-            query = query.filter(Track.artist.ilike(f"%{artist}%"))
+            stmt = stmt.where(Track.artist.ilike(f"%{artist}%"))
         if title:
-            query = query.filter(Track.title.ilike(f"%{title}%"))
+            stmt = stmt.where(Track.title.ilike(f"%{title}%"))
         if album:
-            query = query.filter(Track.album.ilike(f"%{album}%"))
+            stmt = stmt.where(Track.album.ilike(f"%{album}%"))
         if year:
-            query = query.filter_by(year=year)
-
-        if limit:
-            query = query.limit(limit)
+            stmt = stmt.where(Track.year == year)
 
-        return query.all()
+        return self._all(stmt, limit)
 
 
 class DigitalTrackRepository(BaseRepository):
@@ -157,19 +287,33 @@ class DigitalTrackRepository(BaseRepository):
 
     def find_by_file_path(self, file_path: str) -> Optional[DigitalTrack]:
         """Find digital track by file path."""
-        return self.session.query(DigitalTrack).filter_by(file_path=file_path).first()
+        stmt = lambda_stmt(
+            lambda: select(DigitalTrack).where(DigitalTrack.file_path == file_path).limit(1)
+        )
+        return self.session.execute(stmt).scalars().first()
+
+    def find_by_file_paths(self, file_paths: list[str]) -> dict[str, DigitalTrack]:
+        """Find digital tracks for many file paths at once, keyed by path."""
+        found: dict[str, DigitalTrack] = {}
+        for start in range(0, len(file_paths), IN_CLAUSE_CHUNK_SIZE):
+            chunk = file_paths[start : start + IN_CLAUSE_CHUNK_SIZE]
+            stmt = select(DigitalTrack).where(DigitalTrack.file_path.in_(chunk))
+            for digital in self.session.execute(stmt).scalars():
+                found[digital.file_path] = digital
+        return found
 
     def find_by_track_id(self, track_id: int) -> list[DigitalTrack]:
         """Find all digital formats for a track."""
-        return self.session.query(DigitalTrack).filter_by(track_id=track_id).all()
+        stmt = lambda_stmt(lambda: select(DigitalTrack).where(DigitalTrack.track_id == track_id))
+        return list(self.session.execute(stmt).scalars())
 
     def find_by_format(self, format: str) -> list[DigitalTrack]:
         """Find digital tracks by format (mp3, flac, etc.)."""
-        return self.session.query(DigitalTrack).filter_by(format=format).all()
+        return self._all(select(DigitalTrack).where(DigitalTrack.format == format))
 
     def find_by_source_file(self, source_file: str) -> list[DigitalTrack]:
         """Find digital tracks by source file (NML file)."""
-        return self.session.query(DigitalTrack).filter_by(source_file=source_file).all()
+        return self._all(select(DigitalTrack).where(DigitalTrack.source_file == source_file))
 
 
 class PhysicalTrackRepository(BaseRepository):
@@ -180,12 +324,14 @@ class PhysicalTrackRepository(BaseRepository):
 
     def find_by_track_id(self, track_id: int) -> list[PhysicalTrack]:
         """Find all physical formats for a track."""
-        return self.session.query(PhysicalTrack).filter_by(track_id=track_id).all()
+        stmt = lambda_stmt(lambda: select(PhysicalTrack).where(PhysicalTrack.track_id == track_id))
+        return list(self.session.execute(stmt).scalars())
 
     def find_by_release_id(self, release_id: int) -> list[PhysicalTrack]:
-        """Find all tracks on a release."""
+        """Find all tracks on a release, with their tracks loaded."""
         return (
             self.session.query(PhysicalTrack)
+            .options(joinedload(PhysicalTrack.track))
             .filter_by(release_id=release_id)
             .order_by(PhysicalTrack.position)
             .all()
@@ -200,31 +346,26 @@ class ReleaseRepository(BaseRepository):
 
     def find_by_discogs_id(self, discogs_id: int) -> Optional[Release]:
         """Find release by Discogs ID."""
-        return self.session.query(Release).filter_by(discogs_id=discogs_id).first()
+        stmt = select(Release).where(Release.discogs_id == discogs_id).limit(1)
+        return self.session.scalars(stmt).first()
 
     def search_by_title(self, title: str, limit: Optional[int] = None) -> list[Release]:
         """Search releases by title."""
-        query = self.session.query(Release).filter(Release.title.ilike(f"%{title}%"))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+        return self._all(select(Release).where(Release.title.ilike(f"%{title}%")), limit)
 
     def search_by_artist(
         self, artist: str, limit: Optional[int] = None
     ) -> list[Release]:
         """Search releases by artist."""
-        query = self.session.query(Release).filter(Release.artist.ilike(f"%{artist}%"))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+        return self._all(select(Release).where(Release.artist.ilike(f"%{artist}%")), limit)
 
     def find_by_format(self, format_type: str) -> list[Release]:
         """Find releases by format type."""
-        return self.session.query(Release).filter_by(format_type=format_type).all()
+        return self._all(select(Release).where(Release.format_type == format_type))
 
     def find_by_year(self, year: int) -> list[Release]:
         """Find releases by year."""
-        return self.session.query(Release).filter_by(year=year).all()
+        return self._all(select(Release).where(Release.year == year))
 
 
 class ImportBatchRepository(BaseRepository):
@@ -235,30 +376,29 @@ class ImportBatchRepository(BaseRepository):
 
     def find_by_source_type(self, source_type: str) -> list[ImportBatch]:
         """Find import batches by source type."""
-        return (
-            self.session.query(ImportBatch)
-            .filter_by(source_type=source_type)
-            .order_by(ImportBatch.created_at.desc())
-            .all()
+        return self._all(
+            select(ImportBatch)
+            .where(ImportBatch.source_type == source_type)
+            .order_by(ImportBatch.created_at.desc(), ImportBatch.id.desc())
         )
 
     def find_by_status(self, status: str) -> list[ImportBatch]:
         """Find import batches by status."""
-        return (
-            self.session.query(ImportBatch)
-            .filter_by(status=status)
-            .order_by(ImportBatch.created_at.desc())
-            .all()
+        return self._all(
+            select(ImportBatch)
+            .where(ImportBatch.status == status)
+            .order_by(ImportBatch.created_at.desc(), ImportBatch.id.desc())
         )
 
     def get_latest_successful_import(self, source_type: str) -> Optional[ImportBatch]:
         """Get the latest successful import for a source type."""
-        return (
-            self.session.query(ImportBatch)
-            .filter_by(source_type=source_type, status="success")
-            .order_by(ImportBatch.created_at.desc())
-            .first()
+        stmt = (
+            select(ImportBatch)
+            .where(ImportBatch.source_type == source_type, ImportBatch.status == "success")
+            .order_by(ImportBatch.created_at.desc(), ImportBatch.id.desc())
+            .limit(1)
         )
+        return self.session.scalars(stmt).first()
 
 
 class RepositoryManager:
@@ -0,0 +1,68 @@
+"""Cached read queries for the Streamlit UI.
+
+Streamlit reruns the whole script on every widget interaction, so reads are
+cached by their arguments. Results are plain dicts: ORM objects are bound to
+a session that is closed by the time the cached value is reused.
+"""
+
+from typing import Optional
+
+import streamlit as st
+
+from ..models import Track, TrackRepository, db_session_scope
+
+# How long cached query results stay fresh, in seconds
+CACHE_TTL = 60
+CACHE_MAX_ENTRIES = 128
+
+
+def _track_to_dict(track: Track) -> dict:
+    """Convert a track to a plain dict that Streamlit can cache."""
+    return {
+        "id": track.id,
+        "artist": track.artist,
+        "title": track.title,
+        "album": track.album,
+        "label": track.label,
+        "year": track.year,
+        "duration_ms": track.duration_ms,
+    }
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES)
+def get_tracks_cached(limit: Optional[int] = None, offset: int = 0) -> list[dict]:
+    """Get all tracks with optional pagination."""
+    with db_session_scope() as session:
+        tracks = TrackRepository(session).get_all(limit=limit, offset=offset)
+        return [_track_to_dict(track) for track in tracks]
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES)
+def search_tracks_cached(
+    artist: Optional[str] = None,
+    title: Optional[str] = None,
+    album: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Advanced search across multiple fields."""
+    with db_session_scope() as session:
+        tracks = TrackRepository(session).search_tracks(
+            artist=artist, title=title, album=album, year=year, limit=limit
+        )
+        return [_track_to_dict(track) for track in tracks]
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES)
+def find_tracks_by_year_cached(year: int) -> list[dict]:
+    """Find tracks by release year."""
+    with db_session_scope() as session:
+        tracks = TrackRepository(session).find_by_year(year)
+        return [_track_to_dict(track) for track in tracks]
+
+
+def clear_query_cache() -> None:
+    """Drop all cached query results, e.g. after an import changed the data."""
+    get_tracks_cached.clear()
+    search_tracks_cached.clear()
+    find_tracks_by_year_cached.clear()
@@ -0,0 +1,107 @@
+"""Shared pytest configuration for the MusicTool tests.
+
+The database tests run against an in-memory SQLite database per module.
+Modules override ``database_url`` if needed and override ``engine`` to
+create their schema; each test then runs in a SAVEPOINT that is rolled
+back afterwards.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+def pytest_configure(config):
+    """Run benchmarks once as plain tests unless --benchmark-enable is given."""
+    if config.pluginmanager.hasplugin("benchmark"):
+        # pytest-benchmark reads the option in its own (trylast) hook
+        config.option.benchmark_disable = True
+    else:
+        config.addinivalue_line("markers", "benchmark: pytest-benchmark options")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks when pytest-benchmark is not installed."""
+    if config.pluginmanager.hasplugin("benchmark"):
+        return
+    skip = pytest.mark.skip(reason="pytest-benchmark is not installed")
+    for item in items:
+        if "benchmark" in getattr(item, "fixturenames", ()):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    """URL of the test module's in-memory SQLite database."""
+    # Shared-cache URI so any extra connection (e.g. an inspector) sees the
+    # same database; StaticPool keeps it alive, as SQLite drops a shared
+    # in-memory database once its last connection closes
+    return "sqlite:///file::memory:?cache=shared&uri=true"
+
+
+@pytest.fixture(scope="module")
+def engine(database_url):
+    """Create the test module's database engine, without a schema."""
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure_connection(dbapi_connection, _connection_record):
+        # Let SQLAlchemy emit BEGIN itself so test SAVEPOINTs nest inside the
+        # outer transaction; pysqlite would otherwise defer BEGIN until DML
+        dbapi_connection.isolation_level = None
+
+        # Test data is throwaway, so skip durability work
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")  # 20 MB
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def connection(engine):
+    """Open the connection and outer transaction shared by the module's tests."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def session_factory(connection):
+    """Build the session factory once; each test only opens a Session."""
+    return sessionmaker(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+@pytest.fixture
+def session(connection, session_factory):
+    """Create a database session whose changes are rolled back after the test.
+
+    Each test runs in its own SAVEPOINT, which is rolled back afterwards
+    (even if the test committed), so every test starts from the data its
+    module and class have seeded.
+    """
+    savepoint = connection.begin_nested()
+    session = session_factory()
+    yield session
+    session.close()
+    savepoint.rollback()
@@ -0,0 +1,96 @@
+"""Tests for asyncio database configuration and repositories."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+
+from musictool.models.async_config import (  # noqa: E402
+    AsyncDatabaseConfig,
+    _async_database_url,
+    db_session_scope_async,
+    get_async_database_config,
+    initialize_async_database,
+)
+from musictool.models.async_repositories import AsyncRepositoryManager  # noqa: E402
+
+
+def test_async_database_url():
+    """Test plain and sync-driver URLs are switched to their asyncio driver."""
+    assert _async_database_url("sqlite:///musictool.db") == "sqlite+aiosqlite:///musictool.db"
+    assert _async_database_url("postgresql://user:pw@host/db") == "postgresql+asyncpg://user:pw@host/db"
+    assert _async_database_url("sqlite+aiosqlite://") == "sqlite+aiosqlite://"
+    assert _async_database_url("postgresql+psycopg2://user:pw@host/db") == "postgresql+asyncpg://user:pw@host/db"
+    assert _async_database_url("sqlite+pysqlite:///musictool.db") == "sqlite+aiosqlite:///musictool.db"
+
+
+def test_async_database_url_unsupported_backend():
+    """Test backends without a configured asyncio driver are rejected."""
+    with pytest.raises(ValueError, match="No asyncio driver configured for mysql"):
+        _async_database_url("mysql://user:pw@host/db")
+
+
+def test_get_async_database_config_before_init():
+    """Test getting async config before initialization raises error."""
+    import musictool.models.async_config
+
+    musictool.models.async_config.async_db_config = None
+
+    with pytest.raises(RuntimeError, match="Async database not initialized"):
+        get_async_database_config()
+
+
+def test_session_scope_rollback():
+    """Test the async session scope rolls back on exception."""
+
+    async def scenario():
+        config = AsyncDatabaseConfig("sqlite:///:memory:")
+        await config.create_tables()
+
+        with pytest.raises(ValueError):
+            async with config.session_scope() as session:
+                await AsyncRepositoryManager(session).tracks.create(artist="Test", title="Test")
+                raise ValueError("Test exception")
+
+        async with config.session_scope() as session:
+            assert await AsyncRepositoryManager(session).tracks.count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_repository_workflow():
+    """Test CRUD and bulk operations through the async repositories."""
+
+    async def scenario():
+        await initialize_async_database("sqlite:///:memory:")
+
+        async with db_session_scope_async() as session:
+            repos = AsyncRepositoryManager(session)
+            track = await repos.tracks.create(artist="Artist A", title="Song 1")
+            await repos.tracks.create_many(
+                [{"artist": "Artist B", "title": f"Song {i}"} for i in range(2, 5)], chunk_size=2
+            )
+            await repos.digital_tracks.create(
+                track_id=track.id, file_path="/path/file.mp3", format="mp3", source_file="test.nml"
+            )
+
+        async with db_session_scope_async() as session:
+            repos = AsyncRepositoryManager(session)
+            assert await repos.tracks.count() == 4
+            assert len(await repos.tracks.get_all(limit=2, offset=1)) == 2
+
+            found = await repos.tracks.find_by_artist_and_title("Artist A", "Song 1")
+            assert found is not None
+            assert await repos.tracks.find_by_artist_and_title("Artist A", "Missing") is None
+
+            digitals = await repos.digital_tracks.find_by_file_paths(["/path/file.mp3", "/other.mp3"])
+            assert list(digitals) == ["/path/file.mp3"]
+
+            updated = await repos.tracks.update(found.id, year=2024)
+            assert updated.year == 2024
+            assert await repos.digital_tracks.delete(digitals["/path/file.mp3"].id) is True
+            assert await repos.digital_tracks.delete(9999) is False
+
+    asyncio.run(scenario())
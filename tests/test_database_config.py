@@ -4,14 +4,18 @@ import os
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import inspect
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from musictool.models.config import (
     DatabaseConfig,
+    _engine_options,
     db_session_scope,
     get_database_config,
     initialize_database,
 )
 from musictool.models.database import Base, Track
+from musictool.models.repositories import RepositoryManager
 
 
 class TestDatabaseConfig:
@@ -34,6 +38,41 @@ class TestDatabaseConfig:
         config = DatabaseConfig()
         assert config.database_url == "sqlite:///env_test.db"
 
+    @pytest.mark.parametrize(
+        "database_url",
+        [
+            "sqlite:///:memory:",
+            "sqlite:///file::memory:?cache=shared&uri=true",
+            "sqlite:///file:memdb_config?mode=memory&cache=shared&uri=true",
+        ],
+    )
+    def test_memory_database_uses_static_pool(self, database_url):
+        """Test in-memory SQLite shares a single connection."""
+        config = DatabaseConfig(database_url)
+        assert isinstance(config.engine.pool, StaticPool)
+
+    def test_file_database_pool(self):
+        """Test file-based SQLite keeps a regular connection pool."""
+        config = DatabaseConfig("sqlite:///test.db")
+        assert isinstance(config.engine.pool, QueuePool)
+
+    @patch.dict(os.environ, {"DB_POOL_SIZE": "3", "DB_MAX_OVERFLOW": "7"})
+    def test_server_database_pool_options(self):
+        """Test pool options for server databases come from the environment."""
+        options = _engine_options("postgresql://user@localhost/musictool")
+        assert options["poolclass"] is QueuePool
+        assert options["pool_size"] == 3
+        assert options["max_overflow"] == 7
+        assert options["pool_pre_ping"] is True
+
+    def test_sqlite_pragmas(self, tmp_path):
+        """Test SQLite connections are tuned on connect."""
+        config = DatabaseConfig(f"sqlite:///{tmp_path / 'pragmas.db'}")
+
+        with config.engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
     def test_create_tables(self):
         """Test creating database tables."""
         # Use in-memory database for testing
@@ -53,6 +92,41 @@ class TestDatabaseConfig:
         for table in expected_tables:
             assert table in table_names
 
+    def test_create_tables_adds_missing_fts(self, tmp_path):
+        """Test create_tables adds and fills tracks_fts on an older database."""
+        config = DatabaseConfig(f"sqlite:///{tmp_path / 'old.db'}")
+        config.create_tables()
+        with config.engine.begin() as connection:
+            for name in ("insert", "update", "delete"):
+                connection.exec_driver_sql(f"DROP TRIGGER tracks_fts_{name}")
+            connection.exec_driver_sql("DROP TABLE tracks_fts")
+        with config.session_scope() as session:
+            session.add(Track(artist="Daft Punk", title="Around the World"))
+
+        config.create_tables()
+
+        with config.session_scope() as session:
+            tracks = RepositoryManager(session).tracks.search_fts("daft")
+            assert [track.title for track in tracks] == ["Around the World"]
+
+    def test_timestamps_without_server_default(self):
+        """Test timestamps are set on tables created before the server defaults."""
+        config = DatabaseConfig("sqlite:///:memory:")
+        with config.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE tracks (id INTEGER PRIMARY KEY, artist VARCHAR(255) NOT NULL, "
+                "title VARCHAR(255) NOT NULL, album VARCHAR(255), label VARCHAR(255), year INTEGER, "
+                "duration_ms INTEGER, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+
+        with config.session_scope() as session:
+            track = Track(artist="Test", title="Test")
+            session.add(track)
+            session.flush()
+            session.refresh(track)
+            assert track.created_at is not None
+            assert track.updated_at is not None
+
     def test_get_session(self):
         """Test getting a database session."""
         config = DatabaseConfig("sqlite:///:memory:")
@@ -133,6 +207,26 @@ class TestGlobalDatabaseFunctions:
         same_config = get_database_config()
         assert same_config is config
 
+    def test_initialize_database_creates_tables_once(self, tmp_path):
+        """Test tables are only created on the first initialization of a URL."""
+        database_url = f"sqlite:///{tmp_path / 'init.db'}"
+
+        with patch.object(DatabaseConfig, "create_tables") as create_tables:
+            initialize_database(database_url)
+            initialize_database(database_url)
+
+        create_tables.assert_called_once()
+
+    def test_initialize_memory_database_recreates_tables(self):
+        """Test a new engine on a shared in-memory URI gets its tables again."""
+        database_url = "sqlite:///file::memory:?cache=shared&uri=true"
+        initialize_database(database_url).engine.dispose()
+
+        config = initialize_database(database_url)
+
+        assert "tracks" in inspect(config.engine).get_table_names()
+        config.engine.dispose()
+
     def test_get_database_config_before_init(self):
         """Test getting database config before initialization raises error."""
         self.setUp()
@@ -187,7 +281,8 @@ class TestDatabaseIntegration:
                 track_id=track.id,
                 file_path="/test/path/song.mp3",
                 format="mp3",
-                source_file="test.nml"
+                source_file="test.nml",
+                flush=False,
             )
 
             # Create a release
@@ -202,14 +297,16 @@ class TestDatabaseIntegration:
             repos.physical_tracks.create(
                 track_id=track.id,
                 release_id=release.id,
-                position="A1"
+                position="A1",
+                flush=False,
             )
 
             # Create an import batch
             repos.import_batches.create(
                 source_type="test",
                 records_imported=1,
-                status="success"
+                status="success",
+                flush=False,
             )
 
             repos.commit()
@@ -242,12 +339,13 @@ class TestDatabaseIntegration:
         """Test that database indexes are created."""
         config = initialize_database("sqlite:///:memory:")
 
-        # For SQLite, we can check if the tables were created successfully
-        # The indexes should be created automatically with the tables
-        inspector = config.engine.dialect.get_table_names(config.engine.connect())
+        # The inspector reports the tables and indexes create_all() built
+        inspector = inspect(config.engine)
+        expected_tables = {"tracks", "digital_tracks", "physical_tracks", "releases", "import_batches"}
+        assert expected_tables <= set(inspector.get_table_names())
+        track_indexes = {index["name"] for index in inspector.get_indexes("tracks")}
+        assert "ix_tracks_title" in track_indexes
 
-        # Just verify that our main tables exist
-        # (Detailed index checking would require database-specific queries)
         with config.session_scope() as session:
             # Try to query each table to ensure they exist
             session.query(Track).count()
@@ -1,8 +1,12 @@
 """Tests for repository classes."""
 
+import os
+from contextlib import contextmanager
+from types import SimpleNamespace
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_mock_engine, inspect
+from sqlalchemy.orm import Session
 
 from musictool.models.database import (
     Base,
@@ -22,35 +26,77 @@ from musictool.models.repositories import (
 )
 
 
-@pytest.fixture
-def engine():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
+def _render_schema_script() -> str:
+    """Render the SQLite DDL emitted by create_all, FTS objects included."""
+    statements = []
+
+    def _capture(ddl, *_multiparams, **_params):
+        statements.append(str(ddl.compile(dialect=mock_engine.dialect)).strip())
+
+    mock_engine = create_mock_engine("sqlite://", _capture)
+    Base.metadata.create_all(mock_engine, checkfirst=False)
+    return ";\n".join(statements) + ";"
+
+
+SCHEMA_SCRIPT = _render_schema_script()
+
+
+@contextmanager
+def _seed(connection, objects):
+    """Insert objects in a SAVEPOINT that is rolled back on exit.
+
+    Class-scoped fixtures use this to share a dataset that the per-test
+    SAVEPOINTs nest inside.
+    """
+    savepoint = connection.begin_nested()
+    with Session(bind=connection, join_transaction_mode="rollback_only") as seed:
+        seed.bulk_save_objects(objects, return_defaults=True)
+    try:
+        yield objects
+    finally:
+        savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    """Give each pytest-xdist worker its own named in-memory database."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    return f"sqlite:///file:memdb_{worker}?mode=memory&cache=shared&uri=true"
+
+
+@pytest.fixture(scope="module")
+def engine(engine):
+    """Create the schema in the module's database."""
+    # Run the pre-rendered schema in one call instead of create_all
+    dbapi_connection = engine.raw_connection()
+    try:
+        dbapi_connection.executescript(SCHEMA_SCRIPT)
+    finally:
+        dbapi_connection.close()
     return engine
 
 
 @pytest.fixture
-def session(engine):
-    """Create a database session for testing."""
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
+def repos(session):
+    """Create the repositories for the test session."""
+    return RepositoryManager(session)
 
 
-@pytest.fixture
-def sample_tracks(session):
-    """Create sample tracks for testing."""
+@pytest.fixture(scope="class")
+def sample_tracks(connection):
+    """Create sample tracks shared by the tests of a class.
+
+    The tracks live in a class-level SAVEPOINT that the per-test SAVEPOINTs
+    nest inside, so tests that modify them roll back to the same dataset.
+    """
     tracks = [
         Track(artist="Artist A", title="Song 1", album="Album A", year=2020),
         Track(artist="Artist B", title="Song 2", album="Album B", year=2021),
         Track(artist="Artist A", title="Song 3", album="Album A", year=2020),
         Track(artist="Artist C", title="Song 4", year=2022),  # No album
     ]
-    session.add_all(tracks)
-    session.commit()
-    return tracks
+    with _seed(connection, tracks):
+        yield tracks
 
 
 @pytest.fixture
@@ -61,22 +107,73 @@ def sample_releases(session):
         Release(title="Release B", artist="Artist B", format_type="cd", year=2021),
         Release(title="Release C", artist="Artist A", format_type="vinyl", year=2022),
     ]
-    session.add_all(releases)
-    session.commit()
+    session.bulk_save_objects(releases, return_defaults=True)
     return releases
 
 
+@pytest.fixture(scope="class")
+def digital_tracks(connection, sample_tracks):
+    """Create digital tracks in different formats and from different sources.
+
+    Shared by the read-only tests of a class. They use their own paths and
+    leave the first sample track without formats, so they do not show up
+    in the other tests' results.
+    """
+    digitals = [
+        DigitalTrack(
+            track_id=sample_tracks[1].id,
+            file_path="/library/file1.mp3",
+            format="mp3",
+            source_file="source1.nml",
+        ),
+        DigitalTrack(
+            track_id=sample_tracks[2].id,
+            file_path="/library/file2.mp3",
+            format="mp3",
+            source_file="source1.nml",
+        ),
+        DigitalTrack(
+            track_id=sample_tracks[3].id,
+            file_path="/library/file3.flac",
+            format="flac",
+            source_file="source2.nml",
+        ),
+    ]
+    with _seed(connection, digitals):
+        yield digitals
+
+
+@pytest.fixture(scope="class")
+def import_batches(connection):
+    """Create import batches from several sources and in every status.
+
+    Inserted in order, so the later successful Traktor import (150 records)
+    is the latest one.
+    """
+    batches = [
+        ImportBatch(source_type="traktor_nml", status="success", records_imported=100),
+        ImportBatch(source_type="traktor_nml", status="error"),
+        ImportBatch(source_type="traktor_nml", status="success", records_imported=150),
+        ImportBatch(source_type="discogs_api", status="success"),
+        ImportBatch(source_type="discogs_csv", status="error"),
+        ImportBatch(source_type="traktor_nml", status="pending"),
+    ]
+    with _seed(connection, batches):
+        yield batches
+
+
+@pytest.mark.xdist_group(name="track_repository")
 class TestTrackRepository:
     """Test TrackRepository methods."""
 
-    def test_get_model_class(self, session):
+    def test_get_model_class(self, repos):
         """Test get_model_class returns Track."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         assert repo.get_model_class() == Track
 
-    def test_create_track(self, session):
+    def test_create_track(self, repos):
         """Test creating a track."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         track = repo.create(artist="Test Artist", title="Test Song", year=2023)
 
         assert track.id is not None
@@ -84,18 +181,76 @@ class TestTrackRepository:
         assert track.title == "Test Song"
         assert track.year == 2023
 
-    def test_get_by_id(self, session, sample_tracks):
-        """Test getting track by ID."""
+    def test_create_without_flush(self, session, repos):
+        """Test creating a track without flushing it immediately."""
+        repo = repos.tracks
+        track = repo.create(artist="Test Artist", title="Test Song", flush=False)
+
+        assert track.id is None
+        assert track in session.new
+
+        session.flush()
+        assert track.id is not None
+
+    @pytest.mark.usefixtures("sample_tracks")
+    def test_create_many(self, repos):
+        """Test bulk creating tracks."""
+        repo = repos.tracks
+        rows = [{"artist": f"Artist {i}", "title": f"Song {i}"} for i in range(5)]
+
+        repo.create_many(rows, chunk_size=2)
+
+        assert repo.count() == 9  # 4 sample tracks + 5 new ones
+        # Timestamps are filled in by the database
+        assert all(track.created_at is not None for track in repo.get_all())
+        assert repo.find_by_artist_and_title("Artist 4", "Song 4") is not None
+
+    def test_create_many_returning(self, repos):
+        """Test bulk creating tracks and getting their IDs back."""
+        repo = repos.tracks
+        rows = [{"artist": "Artist", "title": f"Song {i}"} for i in range(3)]
+
+        ids = repo.create_many_returning(rows)
+
+        assert len(ids) == 3
+        assert [repo.get_by_id(id).title for id in ids] == ["Song 0", "Song 1", "Song 2"]
+        assert repo.create_many_returning([]) == []
+
+    def test_upsert_many(self, repos, sample_tracks):
+        """Test bulk inserting tracks while skipping existing ones."""
+        repo = repos.tracks
+        rows = [
+            {"artist": "Artist A", "title": "Song 1", "year": 1999},  # Already exists
+            {"artist": "Artist D", "title": "Song 5"},
+            {"artist": "Artist D", "title": "Song 5"},  # Duplicate within the batch
+        ]
+
+        repo.upsert_many(rows)
+        repo.upsert_many([])
+
+        assert repo.count() == 5
+        assert repo.find_by_artist_and_title("Artist A", "Song 1").year == 2020
+
+    def test_upsert_many_unsupported_dialect(self):
+        """Test upserts on a database without ON CONFLICT support are rejected."""
+        session = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
         repo = TrackRepository(session)
+
+        with pytest.raises(ValueError, match="not supported on mysql"):
+            repo.upsert_many([{"artist": "Artist", "title": "Song"}])
+
+    def test_get_by_id(self, repos, sample_tracks):
+        """Test getting track by ID."""
+        repo = repos.tracks
         track = repo.get_by_id(sample_tracks[0].id)
 
         assert track is not None
         assert track.artist == "Artist A"
         assert track.title == "Song 1"
 
-    def test_get_all(self, session, sample_tracks):
+    def test_get_all(self, repos, sample_tracks):
         """Test getting all tracks."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         tracks = repo.get_all()
 
         assert len(tracks) == 4
@@ -104,9 +259,24 @@ class TestTrackRepository:
         limited_tracks = repo.get_all(limit=2)
         assert len(limited_tracks) == 2
 
-    def test_find_by_artist_and_title(self, session, sample_tracks):
+    def test_get_all_offset(self, repos, sample_tracks):
+        """Test paginating tracks with an offset."""
+        repo = repos.tracks
+        tracks = repo.get_all(limit=2, offset=3)
+
+        assert len(tracks) == 1
+        assert tracks[0].title == "Song 4"
+
+    def test_iter_all(self, repos, sample_tracks):
+        """Test streaming all tracks in chunks."""
+        repo = repos.tracks
+        titles = [track.title for track in repo.iter_all(chunk_size=3)]
+
+        assert titles == ["Song 1", "Song 2", "Song 3", "Song 4"]
+
+    def test_find_by_artist_and_title(self, repos, sample_tracks):
         """Test finding track by artist and title."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         track = repo.find_by_artist_and_title("Artist A", "Song 1")
 
         assert track is not None
@@ -117,76 +287,57 @@ class TestTrackRepository:
         no_track = repo.find_by_artist_and_title("Non-existent", "Not Found")
         assert no_track is None
 
-    def test_search_by_artist(self, session, sample_tracks):
-        """Test searching tracks by artist."""
-        repo = TrackRepository(session)
-
-        # Search for "Artist A"
-        tracks = repo.search_by_artist("Artist A")
-        assert len(tracks) == 2
-
-        # Partial search
-        tracks = repo.search_by_artist("Artist")
-        assert len(tracks) == 4  # All tracks have "Artist" in the name
-
-        # With limit
-        tracks = repo.search_by_artist("Artist", limit=2)
-        assert len(tracks) == 2
-
-    def test_search_by_title(self, session, sample_tracks):
-        """Test searching tracks by title."""
-        repo = TrackRepository(session)
-
-        # Search for specific title
-        tracks = repo.search_by_title("Song 1")
-        assert len(tracks) == 1
-        assert tracks[0].title == "Song 1"
-
-        # Partial search
-        tracks = repo.search_by_title("Song")
-        assert len(tracks) == 4
-
-    def test_search_by_album(self, session, sample_tracks):
-        """Test searching tracks by album."""
-        repo = TrackRepository(session)
-
-        # Search for specific album
-        tracks = repo.search_by_album("Album A")
-        assert len(tracks) == 2
-
-        # Partial search
-        tracks = repo.search_by_album("Album")
-        assert len(tracks) == 3  # One track has no album
-
-    def test_find_by_year(self, session, sample_tracks):
-        """Test finding tracks by year."""
-        repo = TrackRepository(session)
-
-        tracks_2020 = repo.find_by_year(2020)
-        assert len(tracks_2020) == 2
-
-        tracks_2021 = repo.find_by_year(2021)
-        assert len(tracks_2021) == 1
-
-    def test_search_tracks_advanced(self, session, sample_tracks):
-        """Test advanced search across multiple fields."""
-        repo = TrackRepository(session)
-
-        # Search by artist and year
-        tracks = repo.search_tracks(artist="Artist A", year=2020)
-        assert len(tracks) == 2
-
-        # Search by multiple criteria
-        tracks = repo.search_tracks(artist="Artist A", album="Album A", year=2020)
-        assert len(tracks) == 2
-
-        # Search with no matches
-        tracks = repo.search_tracks(artist="Non-existent")
-        assert len(tracks) == 0
-
-    def test_get_with_digital_formats(self, session, sample_tracks):
+    @pytest.mark.parametrize(
+        "method,kwargs,expected_count",
+        [
+            pytest.param("search_by_artist", {"artist": "Artist A"}, 2, id="artist"),
+            # All tracks have "Artist" in the name
+            pytest.param("search_by_artist", {"artist": "Artist"}, 4, id="artist_partial"),
+            pytest.param("search_by_artist", {"artist": "Artist", "limit": 2}, 2, id="artist_limit"),
+            pytest.param("search_by_title", {"title": "Song 1"}, 1, id="title"),
+            pytest.param("search_by_title", {"title": "Song"}, 4, id="title_partial"),
+            pytest.param("search_by_album", {"album": "Album A"}, 2, id="album"),
+            # One track has no album
+            pytest.param("search_by_album", {"album": "Album"}, 3, id="album_partial"),
+            pytest.param("find_by_year", {"year": 2020}, 2, id="year_2020"),
+            pytest.param("find_by_year", {"year": 2021}, 1, id="year_2021"),
+            pytest.param("search_tracks", {"artist": "Artist A", "year": 2020}, 2, id="advanced_artist_year"),
+            pytest.param(
+                "search_tracks",
+                {"artist": "Artist A", "album": "Album A", "year": 2020},
+                2,
+                id="advanced_multiple_criteria",
+            ),
+            pytest.param("search_tracks", {"artist": "Non-existent"}, 0, id="advanced_no_matches"),
+        ],
+    )
+    def test_searches(self, repos, sample_tracks, method, kwargs, expected_count):
+        """Test the search and find methods against the sample tracks."""
+        repo = repos.tracks
+        tracks = getattr(repo, method)(**kwargs)
+        assert len(tracks) == expected_count
+
+    def test_search_fts(self, repos, sample_tracks):
+        """Test full-text search across artist, title and album."""
+        repo = repos.tracks
+
+        tracks = repo.search_fts("song 3")
+        assert [track.title for track in tracks] == ["Song 3"]
+
+        # Words match as prefixes
+        assert len(repo.search_fts("art")) == 4
+        assert len(repo.search_fts("art", limit=2)) == 2
+        assert repo.search_fts("   ") == []
+
+        # Index follows updates and deletes
+        repo.update(sample_tracks[0].id, title="Renamed")
+        repo.delete(sample_tracks[2].id)
+        assert [track.title for track in repo.search_fts("renamed")] == ["Renamed"]
+        assert repo.search_fts("song 3") == []
+
+    def test_get_with_digital_formats(self, session, repos, sample_tracks):
         """Test getting tracks with digital formats."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
 
         # Add a digital track
         digital = DigitalTrack(
@@ -196,15 +347,16 @@ class TestTrackRepository:
             source_file="test.nml"
         )
         session.add(digital)
-        session.commit()
+        session.flush()
 
         tracks = repo.get_with_digital_formats()
         assert len(tracks) == 1
         assert tracks[0].id == sample_tracks[0].id
+        assert "digital_tracks" not in inspect(tracks[0]).unloaded
 
-    def test_get_with_physical_formats(self, session, sample_tracks, sample_releases):
+    def test_get_with_physical_formats(self, session, repos, sample_tracks, sample_releases):
         """Test getting tracks with physical formats."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
 
         # Add a physical track
         physical = PhysicalTrack(
@@ -213,15 +365,16 @@ class TestTrackRepository:
             position="A1"
         )
         session.add(physical)
-        session.commit()
+        session.flush()
 
         tracks = repo.get_with_physical_formats()
         assert len(tracks) == 1
         assert tracks[0].id == sample_tracks[0].id
+        assert "physical_tracks" not in inspect(tracks[0]).unloaded
 
-    def test_get_orphaned_tracks(self, session, sample_tracks, sample_releases):
+    def test_get_orphaned_tracks(self, session, repos, sample_tracks, sample_releases):
         """Test getting orphaned tracks (no digital or physical formats)."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
 
         # Initially all tracks are orphaned
         orphaned = repo.get_orphaned_tracks()
@@ -235,57 +388,58 @@ class TestTrackRepository:
             source_file="test.nml"
         )
         session.add(digital)
-        session.commit()
+        session.flush()
 
         orphaned = repo.get_orphaned_tracks()
         assert len(orphaned) == 3  # One less orphaned
 
-    def test_update(self, session, sample_tracks):
+    def test_update(self, session, repos, sample_tracks):
         """Test updating a track."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         track_id = sample_tracks[0].id
 
         updated_track = repo.update(track_id, year=2025, album="Updated Album")
         assert updated_track.year == 2025
         assert updated_track.album == "Updated Album"
 
-        # Verify in database
-        session.commit()
-        fetched_track = repo.get_by_id(track_id)
-        assert fetched_track.year == 2025
-        assert fetched_track.album == "Updated Album"
+        # Verify in database; get_by_id would only hit the identity map
+        session.flush()
+        session.refresh(updated_track)
+        assert updated_track.year == 2025
+        assert updated_track.album == "Updated Album"
 
-    def test_delete(self, session, sample_tracks):
+    def test_delete(self, session, repos, sample_tracks):
         """Test deleting a track."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         track_id = sample_tracks[0].id
 
         result = repo.delete(track_id)
         assert result is True
 
         # Verify deleted
-        session.commit()
+        session.flush()
         deleted_track = repo.get_by_id(track_id)
         assert deleted_track is None
 
-    def test_count(self, session, sample_tracks):
+    def test_count(self, repos, sample_tracks):
         """Test counting tracks."""
-        repo = TrackRepository(session)
+        repo = repos.tracks
         count = repo.count()
         assert count == 4
 
 
+@pytest.mark.xdist_group(name="digital_track_repository")
 class TestDigitalTrackRepository:
     """Test DigitalTrackRepository methods."""
 
-    def test_get_model_class(self, session):
+    def test_get_model_class(self, repos):
         """Test get_model_class returns DigitalTrack."""
-        repo = DigitalTrackRepository(session)
+        repo = repos.digital_tracks
         assert repo.get_model_class() == DigitalTrack
 
-    def test_find_by_file_path(self, session, sample_tracks):
+    def test_find_by_file_path(self, session, repos, sample_tracks):
         """Test finding digital track by file path."""
-        repo = DigitalTrackRepository(session)
+        repo = repos.digital_tracks
 
         # Create digital track
         digital = DigitalTrack(
@@ -295,7 +449,7 @@ class TestDigitalTrackRepository:
             source_file="test.nml"
         )
         session.add(digital)
-        session.commit()
+        session.flush()
 
         found = repo.find_by_file_path("/unique/path/file.flac")
         assert found is not None
@@ -304,9 +458,32 @@ class TestDigitalTrackRepository:
         not_found = repo.find_by_file_path("/non/existent/path")
         assert not_found is None
 
-    def test_find_by_track_id(self, session, sample_tracks):
+    def test_find_by_file_paths(self, session, repos, sample_tracks, monkeypatch):
+        """Test finding digital tracks for many file paths at once."""
+        repo = repos.digital_tracks
+        monkeypatch.setattr("musictool.models.repositories.IN_CLAUSE_CHUNK_SIZE", 2)
+
+        digitals = [
+            DigitalTrack(
+                track_id=track.id,
+                file_path=f"/path/file{i}.mp3",
+                format="mp3",
+                source_file="test.nml"
+            )
+            for i, track in enumerate(sample_tracks)
+        ]
+        session.bulk_save_objects(digitals)
+
+        paths = ["/path/file0.mp3", "/path/file2.mp3", "/path/file3.mp3", "/non/existent/path"]
+        found = repo.find_by_file_paths(paths)
+        assert sorted(found) == paths[:3]
+        assert found["/path/file2.mp3"].track_id == sample_tracks[2].id
+
+        assert repo.find_by_file_paths([]) == {}
+
+    def test_find_by_track_id(self, session, repos, sample_tracks):
         """Test finding digital tracks by track ID."""
-        repo = DigitalTrackRepository(session)
+        repo = repos.digital_tracks
 
         # Create multiple digital tracks for same track
         digitals = [
@@ -323,39 +500,15 @@ class TestDigitalTrackRepository:
                 source_file="test.nml"
             ),
         ]
-        session.add_all(digitals)
-        session.commit()
+        session.bulk_save_objects(digitals)
 
         found = repo.find_by_track_id(sample_tracks[0].id)
         assert len(found) == 2
 
-    def test_find_by_format(self, session, sample_tracks):
+    @pytest.mark.usefixtures("digital_tracks")
+    def test_find_by_format(self, repos):
         """Test finding digital tracks by format."""
-        repo = DigitalTrackRepository(session)
-
-        # Create tracks with different formats
-        digitals = [
-            DigitalTrack(
-                track_id=sample_tracks[0].id,
-                file_path="/path/file1.mp3",
-                format="mp3",
-                source_file="test.nml"
-            ),
-            DigitalTrack(
-                track_id=sample_tracks[1].id,
-                file_path="/path/file2.mp3",
-                format="mp3",
-                source_file="test.nml"
-            ),
-            DigitalTrack(
-                track_id=sample_tracks[2].id,
-                file_path="/path/file3.flac",
-                format="flac",
-                source_file="test.nml"
-            ),
-        ]
-        session.add_all(digitals)
-        session.commit()
+        repo = repos.digital_tracks
 
         mp3_tracks = repo.find_by_format("mp3")
         assert len(mp3_tracks) == 2
@@ -363,33 +516,10 @@ class TestDigitalTrackRepository:
         flac_tracks = repo.find_by_format("flac")
         assert len(flac_tracks) == 1
 
-    def test_find_by_source_file(self, session, sample_tracks):
+    @pytest.mark.usefixtures("digital_tracks")
+    def test_find_by_source_file(self, repos):
         """Test finding digital tracks by source file."""
-        repo = DigitalTrackRepository(session)
-
-        # Create tracks from different sources
-        digitals = [
-            DigitalTrack(
-                track_id=sample_tracks[0].id,
-                file_path="/path/file1.mp3",
-                format="mp3",
-                source_file="source1.nml"
-            ),
-            DigitalTrack(
-                track_id=sample_tracks[1].id,
-                file_path="/path/file2.mp3",
-                format="mp3",
-                source_file="source1.nml"
-            ),
-            DigitalTrack(
-                track_id=sample_tracks[2].id,
-                file_path="/path/file3.mp3",
-                format="mp3",
-                source_file="source2.nml"
-            ),
-        ]
-        session.add_all(digitals)
-        session.commit()
+        repo = repos.digital_tracks
 
         source1_tracks = repo.find_by_source_file("source1.nml")
         assert len(source1_tracks) == 2
@@ -398,21 +528,40 @@ class TestDigitalTrackRepository:
         assert len(source2_tracks) == 1
 
 
+@pytest.mark.xdist_group(name="physical_track_repository")
+class TestPhysicalTrackRepository:
+    """Test PhysicalTrackRepository methods."""
+
+    def test_find_by_release_id(self, session, repos, sample_tracks, sample_releases):
+        """Test finding tracks on a release, ordered by position."""
+        repo = repos.physical_tracks
+
+        physicals = [
+            PhysicalTrack(track_id=sample_tracks[1].id, release_id=sample_releases[0].id, position="B1"),
+            PhysicalTrack(track_id=sample_tracks[0].id, release_id=sample_releases[0].id, position="A1"),
+        ]
+        session.bulk_save_objects(physicals)
+
+        found = repo.find_by_release_id(sample_releases[0].id)
+        assert [physical.position for physical in found] == ["A1", "B1"]
+        assert "track" not in inspect(found[0]).unloaded
+
+
+@pytest.mark.xdist_group(name="release_repository")
 class TestReleaseRepository:
     """Test ReleaseRepository methods."""
 
-    def test_get_model_class(self, session):
+    def test_get_model_class(self, repos):
         """Test get_model_class returns Release."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
         assert repo.get_model_class() == Release
 
-    def test_find_by_discogs_id(self, session, sample_releases):
+    def test_find_by_discogs_id(self, repos, sample_releases):
         """Test finding release by Discogs ID."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
 
         # Update one release with Discogs ID
-        sample_releases[0].discogs_id = 12345
-        session.commit()
+        repo.update(sample_releases[0].id, discogs_id=12345)
 
         found = repo.find_by_discogs_id(12345)
         assert found is not None
@@ -421,9 +570,9 @@ class TestReleaseRepository:
         not_found = repo.find_by_discogs_id(99999)
         assert not_found is None
 
-    def test_search_by_title(self, session, sample_releases):
+    def test_search_by_title(self, repos, sample_releases):
         """Test searching releases by title."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
 
         # Search for specific title
         releases = repo.search_by_title("Release A")
@@ -434,9 +583,9 @@ class TestReleaseRepository:
         releases = repo.search_by_title("Release")
         assert len(releases) == 3
 
-    def test_search_by_artist(self, session, sample_releases):
+    def test_search_by_artist(self, repos, sample_releases):
         """Test searching releases by artist."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
 
         # Search for Artist A (should have 2 releases)
         releases = repo.search_by_artist("Artist A")
@@ -446,9 +595,9 @@ class TestReleaseRepository:
         releases = repo.search_by_artist("Artist B")
         assert len(releases) == 1
 
-    def test_find_by_format(self, session, sample_releases):
+    def test_find_by_format(self, repos, sample_releases):
         """Test finding releases by format."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
 
         vinyl_releases = repo.find_by_format("vinyl")
         assert len(vinyl_releases) == 2
@@ -456,9 +605,9 @@ class TestReleaseRepository:
         cd_releases = repo.find_by_format("cd")
         assert len(cd_releases) == 1
 
-    def test_find_by_year(self, session, sample_releases):
+    def test_find_by_year(self, repos, sample_releases):
         """Test finding releases by year."""
-        repo = ReleaseRepository(session)
+        repo = repos.releases
 
         releases_2020 = repo.find_by_year(2020)
         assert len(releases_2020) == 1
@@ -467,68 +616,41 @@ class TestReleaseRepository:
         assert len(releases_2021) == 1
 
 
+@pytest.mark.xdist_group(name="import_batch_repository")
 class TestImportBatchRepository:
     """Test ImportBatchRepository methods."""
 
-    def test_get_model_class(self, session):
+    def test_get_model_class(self, repos):
         """Test get_model_class returns ImportBatch."""
-        repo = ImportBatchRepository(session)
+        repo = repos.import_batches
         assert repo.get_model_class() == ImportBatch
 
-    def test_find_by_source_type(self, session):
+    @pytest.mark.parametrize(
+        "source_type,expected_count",
+        [("traktor_nml", 4), ("discogs_api", 1), ("discogs_csv", 1)],
+    )
+    @pytest.mark.usefixtures("import_batches")
+    def test_find_by_source_type(self, repos, source_type, expected_count):
         """Test finding import batches by source type."""
-        repo = ImportBatchRepository(session)
-
-        # Create batches with different source types
-        batches = [
-            ImportBatch(source_type="traktor_nml", status="success"),
-            ImportBatch(source_type="traktor_nml", status="error"),
-            ImportBatch(source_type="discogs_api", status="success"),
-        ]
-        session.add_all(batches)
-        session.commit()
-
-        traktor_batches = repo.find_by_source_type("traktor_nml")
-        assert len(traktor_batches) == 2
-
-        discogs_batches = repo.find_by_source_type("discogs_api")
-        assert len(discogs_batches) == 1
-
-    def test_find_by_status(self, session):
+        batches = repos.import_batches.find_by_source_type(source_type)
+        assert len(batches) == expected_count
+        assert all(batch.source_type == source_type for batch in batches)
+
+    @pytest.mark.parametrize(
+        "status,expected_count",
+        [("success", 3), ("error", 2), ("pending", 1)],
+    )
+    @pytest.mark.usefixtures("import_batches")
+    def test_find_by_status(self, repos, status, expected_count):
         """Test finding import batches by status."""
-        repo = ImportBatchRepository(session)
-
-        # Create batches with different statuses
-        batches = [
-            ImportBatch(source_type="traktor_nml", status="success"),
-            ImportBatch(source_type="discogs_api", status="success"),
-            ImportBatch(source_type="discogs_csv", status="error"),
-            ImportBatch(source_type="traktor_nml", status="pending"),
-        ]
-        session.add_all(batches)
-        session.commit()
-
-        success_batches = repo.find_by_status("success")
-        assert len(success_batches) == 2
+        batches = repos.import_batches.find_by_status(status)
+        assert len(batches) == expected_count
+        assert all(batch.status == status for batch in batches)
 
-        error_batches = repo.find_by_status("error")
-        assert len(error_batches) == 1
-
-        pending_batches = repo.find_by_status("pending")
-        assert len(pending_batches) == 1
-
-    def test_get_latest_successful_import(self, session):
+    @pytest.mark.usefixtures("import_batches")
+    def test_get_latest_successful_import(self, repos):
         """Test getting latest successful import."""
-        repo = ImportBatchRepository(session)
-
-        # Create batches at different times
-        batches = [
-            ImportBatch(source_type="traktor_nml", status="success", records_imported=100),
-            ImportBatch(source_type="traktor_nml", status="error"),
-            ImportBatch(source_type="traktor_nml", status="success", records_imported=150),
-        ]
-        session.add_all(batches)
-        session.commit()
+        repo = repos.import_batches
 
         latest = repo.get_latest_successful_import("traktor_nml")
         assert latest is not None
@@ -540,6 +662,7 @@ class TestImportBatchRepository:
         assert no_latest is None
 
 
+@pytest.mark.xdist_group(name="repository_manager")
 class TestRepositoryManager:
     """Test RepositoryManager."""
 
@@ -547,11 +670,14 @@ class TestRepositoryManager:
         """Test that repository manager initializes all repositories."""
         manager = RepositoryManager(session)
 
-        assert isinstance(manager.tracks, TrackRepository)
-        assert isinstance(manager.digital_tracks, DigitalTrackRepository)
-        assert isinstance(manager.physical_tracks, PhysicalTrackRepository)
-        assert isinstance(manager.releases, ReleaseRepository)
-        assert isinstance(manager.import_batches, ImportBatchRepository)
+        for name, repository_class in [
+            ("tracks", TrackRepository),
+            ("digital_tracks", DigitalTrackRepository),
+            ("physical_tracks", PhysicalTrackRepository),
+            ("releases", ReleaseRepository),
+            ("import_batches", ImportBatchRepository),
+        ]:
+            assert type(getattr(manager, name)) is repository_class
 
         # All should use the same session
         assert manager.tracks.session is session
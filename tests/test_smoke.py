@@ -1,12 +1,10 @@
 """Basic smoke tests for MusicTool."""
 
+import os
+import subprocess
 import sys
 from pathlib import Path
 
-# Add src to Python path for testing
-src_path = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(src_path))
-
 
 def test_imports():
     """Test that basic imports work."""
@@ -19,3 +17,15 @@ def test_app_imports():
     import app
     assert hasattr(app, "main")
     assert callable(app.main)
+
+
+def test_app_import_skips_streamlit():
+    """Test that importing the app does not pull in the Streamlit stack."""
+    code = "import sys, app; assert 'streamlit' not in sys.modules"
+    root = Path(__file__).parent.parent
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": str(root / "src")},
+    )
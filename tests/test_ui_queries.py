@@ -0,0 +1,53 @@
+"""Tests for cached UI queries."""
+
+import pytest
+
+from musictool.models.config import db_session_scope, initialize_database
+from musictool.models.database import Track
+from musictool.ui.queries import (
+    clear_query_cache,
+    find_tracks_by_year_cached,
+    get_tracks_cached,
+    search_tracks_cached,
+)
+
+
+@pytest.fixture
+def database():
+    """Initialize an in-memory database with sample tracks."""
+    initialize_database("sqlite:///:memory:")
+    with db_session_scope() as session:
+        session.add_all(
+            [
+                Track(artist="Artist A", title="Song 1", year=2020),
+                Track(artist="Artist B", title="Song 2", year=2021),
+            ]
+        )
+    clear_query_cache()
+    yield
+    clear_query_cache()
+
+
+class TestCachedQueries:
+    """Test cached query functions."""
+
+    def test_results_are_plain_dicts(self, database):
+        """Test cached results are detached from the session."""
+        tracks = get_tracks_cached()
+        assert len(tracks) == 2
+        assert tracks[0]["artist"] == "Artist A"
+
+        assert [track["title"] for track in search_tracks_cached(artist="Artist B")] == ["Song 2"]
+        assert len(find_tracks_by_year_cached(2020)) == 1
+
+    def test_results_are_cached_until_cleared(self, database):
+        """Test new data is only visible after clearing the cache."""
+        assert len(get_tracks_cached()) == 2
+
+        with db_session_scope() as session:
+            session.add(Track(artist="Artist C", title="Song 3"))
+
+        assert len(get_tracks_cached()) == 2
+
+        clear_query_cache()
+        assert len(get_tracks_cached()) == 3